@@ -1,34 +1,130 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-from .utils import clone_or_update_repo, extract_repo_name
-from test_analyzer.analyzer import classify_tests_in_repo, test_patterns, calculate_test_coverage
+import time
+import uuid
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, abort
+from .utils import (clone_or_update_repo, extract_repo_name, get_head_sha, results_cache_path,
+                    file_results_cache_path, load_cached_results, save_cached_results)
+from test_analyzer.analyzer import (classify_tests_in_repo, calculate_test_coverage, RESULTS_VERSION,
+                                    load_file_result_cache, save_file_result_cache)
 from test_analyzer.tech_stack_validator import validate_best_practices
 
 main = Blueprint("main", __name__)
 
-@main.route("/", methods=["GET", "POST"])
-def index():
+# Clone + analysis runs in the background so a slow repository doesn't hold a request
+# worker. Threads are enough here: a job mostly waits on git, and classification
+# fans out to the analyzer's shared process pool.
+executor = ThreadPoolExecutor(max_workers=4)
+jobs = {}  # job_id -> Future returning the analyze_repo result
+job_finished_at = {}  # job_id -> time.monotonic() when its job finished
+# Finished jobs are kept this long so their results page can be reloaded, then dropped
+JOB_TTL_SECONDS = 60 * 60
+
+# Jobs for the same repository share one clone directory, so they must not fetch/reset it
+# while another job is still analyzing it
+repo_locks = defaultdict(threading.Lock)  # repo name -> lock
+repo_locks_guard = threading.Lock()
+
+def get_repo_lock(repo_url):
+    with repo_locks_guard:
+        return repo_locks[extract_repo_name(repo_url)]
+
+def prune_jobs():
+    """Drop jobs that finished more than JOB_TTL_SECONDS ago."""
+    cutoff = time.monotonic() - JOB_TTL_SECONDS
+    for job_id, finished_at in list(job_finished_at.items()):
+        if finished_at < cutoff:
+            jobs.pop(job_id, None)
+            job_finished_at.pop(job_id, None)
+
+def submit_job(repo_url):
+    job_id = uuid.uuid4().hex
+    future = executor.submit(analyze_repo, repo_url)
+    jobs[job_id] = future
+
+    def mark_finished(_):
+        job_finished_at[job_id] = time.monotonic()
+    future.add_done_callback(mark_finished)
+    return job_id
+
+def analyze_repo(repo_url):
+    with get_repo_lock(repo_url):
+        return _analyze_repo(repo_url)
+
+def _analyze_repo(repo_url):
     test_results = None
     error_message = None
     validation_results = None
     coverage = None
 
+    try:
+        repo_path, message = clone_or_update_repo(repo_url)  # repo_path is the actual path
+        if not repo_path:
+            error_message = message  # Show error if repo_path is empty
+        else:
+            # Classification only depends on the checked-out commit, so reuse
+            # a previous result for the same repo URL and HEAD sha
+            cache_path = results_cache_path(repo_url, get_head_sha(repo_path), RESULTS_VERSION)
+            test_results = load_cached_results(cache_path)
+            if test_results is None:
+                # Per-file scan results are kept across restarts, so a new commit of a
+                # known repository only rescans the files that changed
+                file_cache_path = file_results_cache_path(repo_path)
+                load_file_result_cache(file_cache_path)
+                # Only pass the repo_path to classify_tests_in_repo
+                test_results = classify_tests_in_repo(repo_path)
+                save_cached_results(cache_path, test_results)
+                save_file_result_cache(file_cache_path, repo_path)
+            coverage = calculate_test_coverage(test_results)
+            validation_results = validate_best_practices(repo_path)
+    except Exception as e:
+        error_message = f"An error occurred: {str(e)}"
+
+    return {
+        "test_results": test_results,
+        "error_message": error_message,
+        "validation_results": validation_results,
+        "coverage": coverage,
+    }
+
+def render_results(result):
+    test_results = result["test_results"]
+    return render_template("index.html", validation_results=result["validation_results"],
+                           test_results=test_results, error_message=result["error_message"],
+                           coverage=result["coverage"] if test_results else None,
+                           duplicate_tests=test_results.get('duplicate_tests', {}) if test_results else {})
+
+@main.route("/", methods=["GET", "POST"])
+def index():
     if request.method == "POST":
         repo_url = request.form.get("github_url")
         if not repo_url:
-            error_message = "Repository URL is required."
-        else:
-            try:
-                repo_path, message = clone_or_update_repo(repo_url)  # repo_path is the actual path
-                if not repo_path:
-                    error_message = message  # Show error if repo_path is empty
-                else:
-                    # Only pass the repo_path to classify_tests_in_repo
-                    test_results = classify_tests_in_repo(repo_path)
-                    coverage = calculate_test_coverage(test_results)
-                    validation_results = validate_best_practices(repo_path)
-            except Exception as e:
-                error_message = f"An error occurred: {str(e)}"
-
-    return render_template("index.html", validation_results=validation_results,
-                           test_results=test_results, error_message=error_message, coverage=coverage if test_results else None,
-                           duplicate_tests=test_results.get('duplicate_tests', {}) if test_results else {})
\ No newline at end of file
+            return render_template("index.html", error_message="Repository URL is required.")
+
+        prune_jobs()
+        job_id = submit_job(repo_url)
+        # The page polls /status/<job_id> and loads /results/<job_id> once the job is done
+        return render_template("index.html", job_id=job_id)
+
+    return render_template("index.html")
+
+def get_job(job_id):
+    future = jobs.get(job_id)
+    if future is None:
+        abort(404)
+    return future
+
+@main.route("/status/<job_id>")
+def status(job_id):
+    future = get_job(job_id)
+    if not future.done():
+        return jsonify(state="running" if future.running() else "pending", result=None)
+    return jsonify(state="done", result=future.result())
+
+@main.route("/results/<job_id>")
+def results(job_id):
+    future = get_job(job_id)
+    if not future.done():
+        abort(404)
+    return render_results(future.result())
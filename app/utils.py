@@ -1,6 +1,29 @@
 import os
+import json
+import signal
+import shutil
+import hashlib
+import threading
 import subprocess
 
+# Upper bound for a single networked git command, so a hung remote can't pin a worker
+GIT_TIMEOUT_SECONDS = 120
+
+def run_git(args, timeout=GIT_TIMEOUT_SECONDS, env=None):
+    """
+    Run a git command, raising CalledProcessError on failure. On timeout the whole process
+    group is killed (git spawns helpers like git-remote-https) and TimeoutExpired is raised.
+    """
+    process = subprocess.Popen(["git", *args], start_new_session=True, env=env)
+    try:
+        returncode = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+        raise
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
 def extract_repo_name(git_url):
     return git_url.rstrip('/').split('/')[-1].replace(".git", "")
 
@@ -12,10 +35,78 @@ def clone_or_update_repo(git_url, base_dir="cloned_repos"):
         os.makedirs(base_dir)
 
     if os.path.exists(repo_path):
-        return repo_path, "Repository already cloned."
-    else:
-        try:
-            subprocess.check_call(["git", "clone", git_url, repo_path])
-            return repo_path, "Repository cloned successfully."
-        except subprocess.CalledProcessError:
-            return None, "Error cloning repository."
+        # Stop git from searching above base_dir, so a directory that isn't a clone itself
+        # is reported as such instead of resolving to an enclosing repository
+        env = dict(os.environ, GIT_CEILING_DIRECTORIES=os.path.abspath(base_dir))
+        origin_url = get_origin_url(repo_path, env=env)
+        if origin_url is None:
+            # Not a usable clone (e.g. left behind by an interrupted clone); start over from scratch
+            shutil.rmtree(repo_path, ignore_errors=True)
+        elif origin_url != git_url:
+            # Clone directories are named after the repository only, so this is a clone of
+            # another repository with the same name; replace it rather than analyze the wrong code
+            shutil.rmtree(repo_path, ignore_errors=True)
+        else:
+            try:
+                # Move the shallow clone to the remote's current tip so analysis never runs on stale code
+                run_git(["-C", repo_path, "fetch", "--depth", "1", "--no-tags", "origin"], env=env)
+                run_git(["-C", repo_path, "reset", "--hard", "FETCH_HEAD"], env=env)
+                return repo_path, "Repository updated."
+            except subprocess.TimeoutExpired:
+                return None, "Timed out updating repository."
+            except subprocess.CalledProcessError:
+                # The clone itself is intact (the remote was unreachable, say), so keep it
+                return None, "Error updating repository."
+
+    try:
+        # Only the current tree is analyzed, so skip history, other branches and tags
+        run_git(["clone", "--depth", "1", "--single-branch", "--no-tags", git_url, repo_path])
+        return repo_path, "Repository cloned successfully."
+    except subprocess.TimeoutExpired:
+        # A killed clone leaves a partial checkout behind; don't let it pass for a clone next time
+        shutil.rmtree(repo_path, ignore_errors=True)
+        return None, "Timed out cloning repository."
+    except subprocess.CalledProcessError:
+        return None, "Error cloning repository."
+
+def get_origin_url(repo_path, env=None):
+    """
+    Return the URL repo_path was cloned from ("" if it has no origin remote),
+    or None if repo_path is not a git repository.
+    """
+    try:
+        subprocess.run(["git", "-C", repo_path, "rev-parse", "--git-dir"],
+                       env=env, capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    result = subprocess.run(["git", "-C", repo_path, "config", "--get", "remote.origin.url"],
+                            env=env, capture_output=True, text=True)
+    return result.stdout.strip()
+
+def get_head_sha(repo_path):
+    return subprocess.check_output(["git", "-C", repo_path, "rev-parse", "HEAD"]).strip().decode()
+
+def results_cache_path(git_url, sha, version, cache_dir=".cache"):
+    cache_key = hashlib.sha1(f"{git_url}@{sha}#v{version}".encode()).hexdigest()
+    return os.path.join(cache_dir, f"{cache_key}.json")
+
+def file_results_cache_path(repo_path, cache_dir=".cache"):
+    # One file per clone directory, holding the per-file scan results of that checkout
+    return os.path.join(cache_dir, "files", f"{os.path.basename(repo_path)}.json")
+
+def load_cached_results(cache_path):
+    # A missing or unreadable cache file is just a cache miss
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_results(cache_path, results):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # Written to a temporary file and renamed, so concurrent jobs never read a partial file
+    # and a crash mid-write can't leave a truncated entry behind
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(results, f)
+    os.replace(tmp_path, cache_path)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from test_analyzer.analyzer import classify_tests_in_repo
+
+FIXTURE_FILES = {
+    os.path.join("tests", "unit", "test_math.py"): "def test_add():\n    pass\n\ndef test_sub():\n    pass\n",
+    os.path.join("tests", "integration", "test_api.py"): "def test_get():\n    pass\n",
+    os.path.join("e2e", "test_login.py"): "def test_login():\n    pass\n",
+    os.path.join("src", "app.py"): "def add(a, b):\n    return a + b\n",
+}
+
+
+def summarize(repo_path, results):
+    """Reduce classify_tests_in_repo results to what doesn't depend on where the repo lives."""
+    summary = {"counts": results["counts"]}
+    for test_type in ("unit", "integration", "e2e"):
+        summary[test_type] = sorted(
+            (os.path.relpath(info["file_path"], repo_path),
+             info["test_functions"]["names"], info["test_functions"]["lines"])
+            for info in results[f"{test_type}_tests"]
+        )
+    return summary
+
+
+class FileResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+
+    def make_repo(self, name, use_git):
+        repo_path = os.path.join(self.tmp_dir, name)
+        for rel_path, content in FIXTURE_FILES.items():
+            self.write(repo_path, rel_path, content)
+        if use_git:
+            git = ["git", "-C", repo_path, "-c", "user.name=test", "-c", "user.email=test@example.com"]
+            subprocess.run([*git, "init", "-q"], check=True)
+            subprocess.run([*git, "add", "."], check=True)
+            subprocess.run([*git, "commit", "-q", "-m", "fixture"], check=True)
+        return repo_path
+
+    def write(self, repo_path, rel_path, content, mode="w"):
+        file_path = os.path.join(repo_path, rel_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, mode) as f:
+            f.write(content)
+
+    def test_edited_file_is_rescanned(self):
+        for use_git in (False, True):
+            with self.subTest(use_git=use_git):
+                repo_path = self.make_repo(f"edit_{use_git}", use_git)
+                self.assertEqual(classify_tests_in_repo(repo_path)["counts"]["unit"], 2)
+
+                self.write(repo_path, os.path.join("tests", "unit", "test_math.py"),
+                           "\ndef test_mul():\n    pass\n", mode="a")
+                results = summarize(repo_path, classify_tests_in_repo(repo_path))
+                self.assertEqual(results["counts"], {"unit": 3, "integration": 1, "e2e": 1})
+                self.assertIn((os.path.join("tests", "unit", "test_math.py"),
+                               ["test_add", "test_sub", "test_mul"], [1, 4, 7]), results["unit"])
+
+    def test_added_file_is_picked_up(self):
+        for use_git in (False, True):
+            with self.subTest(use_git=use_git):
+                repo_path = self.make_repo(f"add_{use_git}", use_git)
+                self.assertEqual(classify_tests_in_repo(repo_path)["counts"]["unit"], 2)
+
+                # Left untracked in the git checkout
+                self.write(repo_path, os.path.join("tests", "unit", "test_div.py"),
+                           "def test_div():\n    pass\n")
+                results = summarize(repo_path, classify_tests_in_repo(repo_path))
+                self.assertEqual(results["counts"], {"unit": 3, "integration": 1, "e2e": 1})
+                self.assertIn((os.path.join("tests", "unit", "test_div.py"), ["test_div"], [1]),
+                              results["unit"])
+
+    def test_git_and_plain_trees_classify_identically(self):
+        plain_path = self.make_repo("plain", use_git=False)
+        git_path = self.make_repo("git", use_git=True)
+        plain = summarize(plain_path, classify_tests_in_repo(plain_path))
+        self.assertEqual(summarize(git_path, classify_tests_in_repo(git_path)), plain)
+        self.assertEqual(plain["counts"], {"unit": 2, "integration": 1, "e2e": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
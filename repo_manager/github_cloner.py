@@ -10,5 +10,5 @@ def clone_repo(github_url: str, project_name: str) -> str:
         return project_path
 
     print(f"Cloning {github_url} into {project_path}")
-    Repo.clone_from(github_url, project_path)
+    Repo.clone_from(github_url, project_path, depth=1, single_branch=True, no_tags=True)
     return project_path
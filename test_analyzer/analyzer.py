@@ -1,11 +1,23 @@
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache
+import mmap
+import stat
+import multiprocessing
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import subprocess
+import threading
 import json
 from collections import defaultdict
 
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the shape of the classify_tests_in_repo result changes, so results
+# persisted by callers under an older layout are not mistaken for current ones
+RESULTS_VERSION = 2
+
 # Define patterns for unit, integration, and e2e tests across multiple languages
 test_patterns = {
     "unit": [
@@ -29,14 +41,14 @@ test_patterns = {
     "integration": [
         r"@SpringBootTest",  # Spring Integration test
         r"testcontainers",  # Docker-based integration
-        r"with_database\(.*\)",  # Custom integration
-        r"\bservice\b",  # Service-level testing
-        r"\bapi\b",  # API-related tests
+        r"with_database\(",  # Custom integration
+        r"@Service\b",  # Service-level testing
+        r"/api/",  # Calls against API endpoints
         r"IntegrationTest",  # Integration test naming
     ],
     "e2e": [
         r"@E2ETest",  # Custom e2e annotation
-        r"\b(user|login|end-to-end|browser|e2e)\b",  # E2E test patterns
+        r"end-to-end",  # E2E test patterns
         r"e2e",  # General keyword for E2E tests
         r"\.spec\.js$",  # E2E test files
         r"\.feature$",  # Cucumber feature files
@@ -44,146 +56,298 @@ test_patterns = {
     ]
 }
 
-def is_test_file(file_path):
+def literal_text(pattern):
+    """
+    Return the plain text a pattern matches if it uses no regex syntax besides escapes, else None.
+    """
+    text = re.sub(r'\\(.)', r'\1', pattern)
+    return text if re.escape(text) == pattern else None
+
+# Every pattern is named "<test_type>_<index>" so a hit can be mapped back to its test type.
+# Plain-text patterns are checked with substring searches on the lower-cased content,
+# which is far cheaper than stepping them through the regex engine.
+LITERAL_TEST_PATTERNS = [
+    (f"{test_type}_{i}", literal_text(pattern).lower().encode())
+    for test_type, patterns in test_patterns.items()
+    for i, pattern in enumerate(patterns)
+    if literal_text(pattern) is not None
+]
+
+# The remaining patterns are fused into a single alternation so a file is scanned once
+# rather than once per pattern, with each branch as a named group.
+# Patterns are compiled as bytes so they can run directly on mmap'd files.
+TEST_PATTERNS_RE = re.compile(
+    "|".join(
+        f"(?P<{test_type}_{i}>{pattern})"
+        for test_type, patterns in test_patterns.items()
+        for i, pattern in enumerate(patterns)
+        if literal_text(pattern) is None
+    ).encode(),
+    re.IGNORECASE | re.MULTILINE,
+)
+
+TEST_FUNCTION_RE = re.compile(rb'def\s+(test_\w+)\s*\(')
+
+# File names that follow a test naming convention (test_x.py, x_test.go, x.spec.js,
+# FooTests.cs, ...). Such files are taken to be test files without searching their content.
+# The Java/C#/Kotlin suffix stays case-sensitive so names like "latest.java" don't match.
+TEST_FILENAME_RE = re.compile(
+    r'(?:^test_|_test\.|\.test\.|\.spec\.|(?-i:Tests?)\.(?:cs|java|kt)$|\.feature$)',
+    re.IGNORECASE,
+)
+
+# Directories that never contain the repository's own tests (VCS metadata,
+# dependencies, build output); they are pruned without being descended into
+IGNORED_DIRS = {
+    '.git', '.hg', '.svn', 'node_modules', 'venv', '.venv', '__pycache__',
+    'build', 'dist', 'target', 'bin', 'obj', '.idea', '.tox',
+    '.mypy_cache', '.pytest_cache', 'coverage', 'vendor'
+}
+
+# Common test file extensions (a tuple so str.endswith can check them all in one call)
+TEST_EXTENSIONS = (".py", ".js", ".ts", ".java", ".kt", ".cs", ".rb", ".feature")
+
+# Files to exclude
+EXCLUDED_FILES = {
+    'package.json', 'package-lock.json', 'yarn.lock',
+    'tsconfig.json', 'jest.config.js', 'pytest.ini',
+    'conftest.py', 'webpack.config.js', 'babel.config.js',
+    'karma.conf.js', 'cypress.json', 'playwright.config.js',
+    'jest.config.ts', 'tsconfig.json', 'Gemfile', 'Gemfile.lock',
+    'go.mod', 'go.sum', 'Cargo.toml', 'Cargo.lock',
+    'composer.json', 'composer.lock', 'nuget.config',
+    '.gitignore', 'README.md', 'requirements.txt',
+    'setup.py', 'pom.xml', 'build.gradle'
+}
+
+# Files larger than this are generated code or bundles, not hand-written tests
+MAX_FILE_BYTES = 512 * 1024
+# Upper bound on files sent to a worker process per task; test files are small,
+# so per-task pickling/IPC would otherwise cost more than scanning them
+FILES_PER_TASK = 64
+# Below this size a plain read is cheaper than setting up and tearing down a mapping
+MMAP_MIN_BYTES = 4096
+# How much of a file to sniff for NUL bytes when deciding whether it is binary
+BINARY_SNIFF_BYTES = 4096
+# Test frameworks are imported/declared near the top of a file, so only this much of it
+# is searched for test patterns; large non-test files are rejected without a full scan
+PATTERN_PEEK_BYTES = 64 * 1024
+# Upper bound on remembered per-file results before the cache is dropped and refilled
+FILE_CACHE_MAX_ENTRIES = 100_000
+
+# file path -> ((mtime_ns, size), count_test_cases_in_file result). Lets a re-analysis
+# of an updated checkout rescan only the files that actually changed.
+_file_result_cache = {}
+# Files load_file_result_cache has already seeded _file_result_cache from
+_loaded_result_cache_paths = set()
+
+# Process pool shared by every scan, see get_process_pool
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+@contextmanager
+def map_file(file_path):
+    """
+    Map a file read-only and yield its contents as a bytes-like buffer.
+    Avoids copying and UTF-8 decoding the whole file before scanning it.
+    Small files are read into bytes instead, which is cheaper than mapping them.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            # Also covers empty files, which mmap cannot map
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+def iter_repo_files(repo_path):
     """
-    Check if a file is a test file by examining its content.
+    Yield an os.DirEntry for every file under repo_path, skipping IGNORED_DIRS.
+    Uses os.scandir so file/dir checks come from the directory listing instead of extra stat calls.
     """
+    stack = [repo_path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError:
+            # Unreadable directory; os.walk would skip it too
+            continue
+
+def list_git_files(repo_path):
+    """
+    List the working tree files of a git checkout, tracked or untracked but not ignored, with a
+    single git ls-files call. Tracked files come from the index, but finding untracked ones
+    still makes git walk every directory that isn't gitignored, IGNORED_DIRS included;
+    those are only filtered out of its output.
+    Returns None if repo_path is not the root of a git checkout.
+    """
+    if not os.path.isdir(os.path.join(repo_path, '.git')):
+        return None
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            
-        # Check if file contains any test patterns
-        for patterns in test_patterns.values():
-            if any(re.search(pattern, content, re.IGNORECASE) for pattern in patterns):
-                return True
-                
-        return False
-    except:
+        output = subprocess.run(["git", "-C", repo_path, "ls-files", "-z",
+                                 "--cached", "--others", "--exclude-standard"],
+                                capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    git_files = []
+    # git paths are '/'-separated and relative to the root; joining them onto a
+    # precomputed prefix avoids an os.path.join call per file
+    prefix = os.path.join(repo_path, '')
+    for path in output.split(b'\0'):
+        if not path:
+            continue
+        rel_path = os.fsdecode(path)
+        parts = rel_path.split('/')
+        if IGNORED_DIRS.intersection(parts[:-1]):
+            continue
+        git_files.append(prefix + rel_path.replace('/', os.sep))
+    return git_files
+
+def is_candidate_test_file(file):
+    """
+    Check whether a file name could belong to a test file, before looking at its content.
+    """
+    # Check file extension first, it rejects most files in a repository
+    if not file.endswith(TEST_EXTENSIONS):
         return False
 
-def find_test_files(repo_path):
+    # Skip excluded files
+    return file not in EXCLUDED_FILES and not file.startswith('.')
+
+def find_test_pattern(content):
     """
-    Find test files by looking for actual test code in files.
+    Return the name ("<test_type>_<index>") of a test pattern occurring in content, or None.
     """
-    test_files = []
-    
-    # Common test file extensions
-    test_extensions = {".py", ".js", ".ts", ".java", ".kt", ".cs", ".rb", ".feature"}
-    
-    # Files to exclude
-    excluded_files = {
-        'package.json', 'package-lock.json', 'yarn.lock',
-        'tsconfig.json', 'jest.config.js', 'pytest.ini',
-        'conftest.py', 'webpack.config.js', 'babel.config.js',
-        'karma.conf.js', 'cypress.json', 'playwright.config.js',
-        'jest.config.ts', 'tsconfig.json', 'Gemfile', 'Gemfile.lock',
-        'go.mod', 'go.sum', 'Cargo.toml', 'Cargo.lock',
-        'composer.json', 'composer.lock', 'nuget.config',
-        '.gitignore', 'README.md', 'requirements.txt',
-        'setup.py', 'pom.xml', 'build.gradle'
-    }
-    
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            # Skip excluded files
-            if file in excluded_files or file.startswith('.'):
+    lowered = content[:].lower()
+    for name, literal in LITERAL_TEST_PATTERNS:
+        if lowered.find(literal) != -1:
+            return name
+    match = TEST_PATTERNS_RE.search(content)
+    return match.lastgroup if match else None
+
+def iter_test_files(repo_path):
+    """
+    Yield (file_path, os.stat_result) for candidate test files by extension and name.
+    Whether a candidate actually contains test code is decided by count_test_cases_in_file,
+    so each file is only read once.
+    """
+    found = 0
+
+    git_files = list_git_files(repo_path)
+    if git_files is not None:
+        for file_path in git_files:
+            if not is_candidate_test_file(os.path.basename(file_path)):
                 continue
-                
-            # Check file extension
-            if not any(file.endswith(ext) for ext in test_extensions):
+            # Only regular files (not symlinks, submodules or files deleted from the
+            # working tree), and skip huge files before they reach the regex scan
+            try:
+                st = os.lstat(file_path)
+            except OSError:
                 continue
-                
-            file_path = os.path.join(root, file)
-            
-            # Check if file contains test code
-            if is_test_file(file_path):
-                print(f"[TEST DEBUG] Found test file: {file_path}")
-                test_files.append(file_path)
-            else:
-                print(f"[TEST DEBUG] Not a test file: {file_path}")
+            if stat.S_ISREG(st.st_mode) and st.st_size <= MAX_FILE_BYTES:
+                found += 1
+                yield file_path, st
+    else:
+        # Not a git checkout, fall back to walking the directory tree
+        for entry in iter_repo_files(repo_path):
+            if not is_candidate_test_file(entry.name):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if st.st_size <= MAX_FILE_BYTES:
+                found += 1
+                yield entry.path, st
     
-    print(f"[TEST DEBUG] Total test files found: {len(test_files)}")
-    return test_files
+    logger.debug("Total candidate test files found: %d", found)
 
 def count_test_cases_in_file(file_path):
     """
     Count test cases in a single file, classifying as unit, integration, or e2e for Python based on filename, folder, pytest markers, and folder structure.
-    Also extract test function names and their locations for duplicate detection.
+    Also extract test function names and their locations for duplicate detection, as parallel
+    'names' and 'lines' lists rather than a dict per function.
+    Returns None if the file contains no test patterns at all, i.e. it is not a test file.
     """
     try:
-        print(f"[TEST DEBUG] Processing file: {file_path}")
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
+        logger.debug("Processing file: %s", file_path)
         counts = {"unit": 0, "integration": 0, "e2e": 0}
-        filename = os.path.basename(file_path).lower()
-        folder = os.path.dirname(file_path).lower()
+        # The file name and folder are both part of the full path, so one check covers all three
         full_path = file_path.lower()
+        is_integration = 'integration' in full_path
+        is_e2e = 'e2e' in full_path
         
-        # Extract test function names and their locations
-        test_functions = []
-        for match in re.finditer(r'def\s+(test_\w+)\s*\(', content):
-            test_functions.append({
-                'name': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        print(f"[TEST DEBUG] Found {len(test_functions)} test functions in {file_path}")
+        with map_file(file_path) as content:
+            # Binary files are never test files
+            if content.find(b'\x00', 0, BINARY_SNIFF_BYTES) != -1:
+                logger.debug("Skipping binary file: %s", file_path)
+                return None
+
+            # Conventionally named test files are test files; anything else has to
+            # contain a test pattern near the top
+            if TEST_FILENAME_RE.search(os.path.basename(file_path)):
+                logger.debug("Found test file (by name): %s", file_path)
+            else:
+                pattern_name = find_test_pattern(content[:PATTERN_PEEK_BYTES])
+                if not pattern_name:
+                    logger.debug("Not a test file: %s", file_path)
+                    return None
+                logger.debug("Found test file (matched pattern %s): %s", pattern_name, file_path)
+
+            # Extract test function names and their locations. Line numbers are
+            # counted incrementally between matches so the file is only counted once.
+            names = []
+            lines = []
+            line, last_start = 1, 0
+            for match in TEST_FUNCTION_RE.finditer(content):
+                start = match.start()
+                line += content[last_start:start].count(b'\n')
+                last_start = start
+                names.append(match.group(1).decode())
+                lines.append(line)
+            # Only search the content for pytest markers when the path hasn't already
+            # classified the file and there are test functions to attribute
+            if names:
+                if not is_integration:
+                    is_integration = content.find(b'@pytest.mark.integration') != -1
+                if not is_e2e:
+                    is_e2e = content.find(b'@pytest.mark.e2e') != -1
+        logger.debug("Found %d test functions in %s", len(names), file_path)
         
         # Integration test detection
-        is_integration = (
-            'integration' in filename or
-            'integration' in folder or
-            'integration' in full_path or
-            '@pytest.mark.integration' in content
-        )
-        print(f"[TEST DEBUG] Is integration test: {is_integration}")
+        logger.debug("Is integration test: %s", is_integration)
         if is_integration:
-            counts["integration"] = len(test_functions)
+            counts["integration"] = len(names)
         
         # E2E test detection
-        is_e2e = (
-            'e2e' in filename or
-            'e2e' in folder or
-            'e2e' in full_path or
-            '@pytest.mark.e2e' in content
-        )
-        print(f"[TEST DEBUG] Is E2E test: {is_e2e}")
+        logger.debug("Is E2E test: %s", is_e2e)
         if is_e2e:
-            counts["e2e"] = len(test_functions)
+            counts["e2e"] = len(names)
         
         # Unit test detection - count all test functions unless they're already counted as integration or e2e
-        if test_functions:
-            counts["unit"] = len(test_functions)
+        if names:
+            counts["unit"] = len(names)
             # Remove from unit count if already counted as integration or e2e
             if counts["integration"] > 0:
                 counts["unit"] = 0
             if counts["e2e"] > 0:
                 counts["unit"] = 0
-            print(f"[TEST DEBUG] Final counts: {counts}")
+            logger.debug("Final counts: %s", counts)
         
         return {
             'counts': counts,
-            'test_functions': test_functions
+            'test_functions': {'names': names, 'lines': lines}
         }
-    except Exception as e:
-        print(f"Error processing file {file_path}: {str(e)}")
-        return {"counts": {"unit": 0, "integration": 0, "e2e": 0}, "test_functions": []}
-    except Exception as e:
-        print(f"Error processing file {file_path}: {str(e)}")
-        return {"unit": 0, "integration": 0, "e2e": 0}
-
-def find_duplicate_tests_across_layers(test_results):
-    """
-    Find duplicate test files (by filename) that appear in more than one test type (unit, integration, e2e).
-    Returns a dict: {filename: [list of types]}
-    """
-    file_to_types = defaultdict(set)
-    for test_type in ['unit', 'integration', 'e2e']:
-        for file_path in test_results.get(f'{test_type}_tests', []):
-            filename = os.path.basename(file_path)
-            file_to_types[filename].add(test_type)
-    # Only keep files that appear in more than one type
-    duplicates = {fname: list(types) for fname, types in file_to_types.items() if len(types) > 1}
-    return duplicates
+    except (OSError, ValueError) as e:
+        logger.warning("Error processing file %s: %s", file_path, e)
+        return {"counts": {"unit": 0, "integration": 0, "e2e": 0}, "test_functions": {"names": [], "lines": []}}
 
 def find_duplicate_tests_across_layers(test_results):
     """
@@ -196,49 +360,159 @@ def find_duplicate_tests_across_layers(test_results):
         "e2e": []
     }
     
-    # Track all test functions by name
-    all_functions = {}
-    
-    # First pass: collect all test functions
-    for test_type in ['unit', 'integration', 'e2e']:
+    # Collect every location of each test function name in a single pass
+    func_locations = defaultdict(list)
+    for test_type in duplicates:
         for test_info in test_results.get(f"{test_type}_tests", []):
-            for func in test_info.get("test_functions", []):
-                func_name = func.get('name')
-                if func_name:
-                    if func_name not in all_functions:
-                        all_functions[func_name] = []
-                    all_functions[func_name].append({
-                        'layer': test_type,
-                        'file': test_info['file_path'],
-                        'line': func.get('line', 0)
-                    })
+            file_path = test_info['file_path']
+            test_functions = test_info['test_functions']
+            for func_name, line in zip(test_functions['names'], test_functions['lines']):
+                func_locations[func_name].append((test_type, file_path, line))
     
-    # Second pass: detect duplicates
-    for func_name, locations in all_functions.items():
-        if len(locations) > 1:  # This function appears in multiple layers
-            # Get all unique layers where this function appears
-            layers = set(loc['layer'] for loc in locations)
-            
-            # Create duplicate entries for each layer
-            for loc in locations:
-                # Find other layers where this function appears
-                other_layers = layers - {loc['layer']}
-                if other_layers:
-                    duplicates[loc['layer']].append({
-                        'function': func_name,
-                        'file': loc['file'],
-                        'line': loc['line'],
-                        'other_layers': list(other_layers)
-                    })
+    # Report every location of a function that also appears in another layer
+    for func_name, locations in func_locations.items():
+        if len(locations) < 2:
+            continue
+        layers = {layer for layer, _, _ in locations}
+        if len(layers) < 2:
+            continue
+        for layer, file_path, line in locations:
+            duplicates[layer].append({
+                'function': func_name,
+                'file': file_path,
+                'line': line,
+                'other_layers': list(layers - {layer})
+            })
     
     return duplicates
 
+def load_file_result_cache(cache_path):
+    """
+    Seed the per-file result cache from a file written by save_file_result_cache, once per
+    cache_path. Entries for files changed since then are simply never hit, as their mtime
+    and size differ. Entries without the layout save_file_result_cache writes are skipped.
+    """
+    if cache_path in _loaded_result_cache_paths:
+        return
+    _loaded_result_cache_paths.add(cache_path)
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return
+    if not isinstance(data, dict) or data.get('version') != RESULTS_VERSION:
+        return
+    files = data.get('files')
+    if not isinstance(files, dict):
+        return
+    for file_path, entry in files.items():
+        if not (isinstance(entry, list) and len(entry) == 2
+                and isinstance(entry[0], list) and len(entry[0]) == 2):
+            continue
+        key, file_result = entry
+        if file_result is not None and not (isinstance(file_result, dict)
+                                            and {'counts', 'test_functions'} <= file_result.keys()):
+            continue
+        _file_result_cache.setdefault(file_path, (tuple(key), file_result))
+
+def save_file_result_cache(cache_path, repo_path):
+    """
+    Write the per-file results for files under repo_path to cache_path so they survive
+    a restart. Each repository gets its own file, so saving after a scan doesn't
+    rewrite the results of every other repository.
+    """
+    prefix = os.path.join(repo_path, '')
+    files = {file_path: entry for file_path, entry in dict(_file_result_cache).items()
+             if file_path.startswith(prefix)}
+    os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+    # Written to a temporary file and renamed, so a concurrent reader never sees a partial file
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': RESULTS_VERSION, 'files': files}, f)
+    os.replace(tmp_path, cache_path)
+
+def get_process_pool():
+    """
+    Return the process pool shared by all scans, creating it on first use. Workers are
+    started from a forkserver rather than forked from the caller, since forking a process
+    that is running other threads (the web app's analysis jobs) can deadlock the child.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _process_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                mp_context=multiprocessing.get_context(method))
+        return _process_pool
+
+def discard_process_pool(pool):
+    """
+    Stop sharing pool, so the next get_process_pool call starts a new one.
+    Does nothing to the shared pool if another caller already replaced pool.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is pool:
+            _process_pool = None
+    pool.shutdown(wait=False)
+
+def map_in_pool(fn, *sequences):
+    """
+    Return [fn(*args) for args in zip(*sequences)], computed in the shared process pool.
+    Regex scanning is CPU-bound and holds the GIL, so processes are used rather than threads.
+    Items are sent in batches of up to FILES_PER_TASK, but never so large that some
+    workers are left idle.
+    """
+    workers = os.cpu_count() or 1
+    chunksize = max(1, min(FILES_PER_TASK, -(-len(sequences[0]) // workers)))
+    pool = get_process_pool()
+    try:
+        return list(pool.map(fn, *sequences, chunksize=chunksize))
+    except BrokenProcessPool:
+        # A worker that died (e.g. killed for memory) breaks the pool for good;
+        # retry once in a new one
+        logger.warning("Process pool broke, retrying in a new one")
+        discard_process_pool(pool)
+        return list(get_process_pool().map(fn, *sequences, chunksize=chunksize))
+
+def count_test_cases_in_files(test_files):
+    """
+    Run count_test_cases_in_file over the (file_path, os.stat_result) pairs yielded by
+    test_files, reusing cached results for files whose mtime and size are unchanged. Only
+    the remaining files are sent to the process pool. Returns (file_path, result) pairs
+    in the order test_files yielded them.
+    """
+    file_results = []
+    misses = []
+    # Cache lookups happen as paths are yielded, so discovery and lookup are one pass
+    for i, (file_path, st) in enumerate(test_files):
+        key = (st.st_mtime_ns, st.st_size)
+        cached = _file_result_cache.get(file_path)
+        if cached is not None and cached[0] == key:
+            file_results.append((file_path, cached[1]))
+        else:
+            file_results.append((file_path, None))
+            misses.append((i, file_path, key))
+    logger.debug("File result cache: %d hits, %d misses",
+                 len(file_results) - len(misses), len(misses))
+    if not misses:
+        return file_results
+
+    scanned = map_in_pool(count_test_cases_in_file, [file_path for _, file_path, _ in misses])
+    if len(_file_result_cache) + len(misses) > FILE_CACHE_MAX_ENTRIES:
+        _file_result_cache.clear()
+        _loaded_result_cache_paths.clear()
+    for (i, file_path, key), file_result in zip(misses, scanned):
+        file_results[i] = (file_path, file_result)
+        _file_result_cache[file_path] = (key, file_result)
+    return file_results
+
 def classify_tests_in_repo(repo_path):
     """
     Classifies tests into unit, integration, and e2e based on file names and patterns in the code.
-    Uses parallel processing for better performance.
+    Uses parallel processing for better performance. Per-file results are cached and shared
+    between calls, so callers must treat the returned dict as read-only.
     """
-    test_files = find_test_files(repo_path)
     results = {
         "unit_tests": [],
         "integration_tests": [],
@@ -250,34 +524,27 @@ def classify_tests_in_repo(repo_path):
         }
     }
     
-    # Process files in parallel
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        file_results = list(executor.map(count_test_cases_in_file, test_files))
+    file_results = count_test_cases_in_files(iter_test_files(repo_path))
     
-    # Aggregate results
-    for file_path, file_result in zip(test_files, file_results):
+    # Aggregate results, with the per-type list appends and totals bound to locals
+    totals = results["counts"]
+    buckets = [(test_type, results[f"{test_type}_tests"].append)
+               for test_type in ("unit", "integration", "e2e")]
+    for file_path, file_result in file_results:
+        if file_result is None:
+            continue
         counts = file_result["counts"]
-        test_functions = file_result["test_functions"]
+        test_info = {
+            "file_path": file_path,
+            "test_functions": file_result["test_functions"]
+        }
         
         # Add to appropriate test type
-        if counts["unit"] > 0:
-            results["unit_tests"].append({
-                "file_path": file_path,
-                "test_functions": test_functions
-            })
-            results["counts"]["unit"] += counts["unit"]
-        if counts["integration"] > 0:
-            results["integration_tests"].append({
-                "file_path": file_path,
-                "test_functions": test_functions
-            })
-            results["counts"]["integration"] += counts["integration"]
-        if counts["e2e"] > 0:
-            results["e2e_tests"].append({
-                "file_path": file_path,
-                "test_functions": test_functions
-            })
-            results["counts"]["e2e"] += counts["e2e"]
+        for test_type, append in buckets:
+            count = counts[test_type]
+            if count:
+                append(test_info)
+                totals[test_type] += count
     
     # Find duplicates
     results["duplicate_tests"] = find_duplicate_tests_across_layers(results)
@@ -286,16 +553,23 @@ def classify_tests_in_repo(repo_path):
 def find_js_projects(repo_path):
     """Recursively find all JS projects (folders with package.json and a test script)."""
     js_projects = []
-    for root, dirs, files in os.walk(repo_path):
-        if 'package.json' in files:
-            pkg_path = os.path.join(root, 'package.json')
-            try:
-                with open(pkg_path, 'r') as f:
-                    pkg = json.load(f)
-                if 'scripts' in pkg and 'test' in pkg['scripts']:
-                    js_projects.append(root)
-            except Exception as e:
-                print(f"[COVERAGE DEBUG] Error reading {pkg_path}: {e}")
+    for entry in iter_repo_files(repo_path):
+        if entry.name != 'package.json':
+            continue
+        pkg_path = entry.path
+        try:
+            if entry.stat().st_size > MAX_FILE_BYTES:
+                continue
+            with open(pkg_path, 'rb') as f:
+                raw = f.read()
+            # Only parse manifests that can possibly declare a test script
+            if b'"scripts"' not in raw or b'"test"' not in raw:
+                continue
+            pkg = json.loads(raw)
+            if 'scripts' in pkg and 'test' in pkg['scripts']:
+                js_projects.append(os.path.dirname(pkg_path))
+        except Exception as e:
+            logger.debug("Error reading %s: %s", pkg_path, e)
     return js_projects
 
 def calculate_test_coverage(test_results):
@@ -311,16 +585,6 @@ def calculate_test_coverage(test_results):
         'e2e': {'test_count': 0, 'total_testable_functions': 0, 'coverage_percentage': 0.0, 'files': {}}
     }
     
-    # Get all testable functions (functions that start with test_)
-    def get_testable_functions(file_path):
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            return len(re.findall(r'def\s+test_\w+', content))
-        except Exception as e:
-            print(f"Error processing file {file_path}: {str(e)}")
-            return 0
-
     # For each test type
     for test_type in ['unit', 'integration', 'e2e']:
         test_files = test_results.get(f'{test_type}_tests', [])
@@ -330,8 +594,10 @@ def calculate_test_coverage(test_results):
         # Process each file
         for file_info in test_files:
             file_path = file_info['file_path']
-            test_count = len(file_info['test_functions'])
-            total_functions = get_testable_functions(file_path)
+            test_count = len(file_info['test_functions']['names'])
+            # Testable functions are the test_ functions count_test_cases_in_file already
+            # extracted, so the file doesn't need to be opened and scanned again
+            total_functions = test_count
             
             # Store file-level stats
             coverage[test_type]['files'][file_path] = {
@@ -356,7 +622,8 @@ def calculate_test_coverage(test_results):
             
             # Add a warning if test_count exceeds total_testable_functions
             if coverage[test_type]['test_count'] > coverage[test_type]['total_testable_functions']:
-                print(f"[COVERAGE WARNING] {test_type} test count ({coverage[test_type]['test_count']}) exceeds total testable functions ({coverage[test_type]['total_testable_functions']})")
+                logger.warning("%s test count (%d) exceeds total testable functions (%d)", test_type,
+                               coverage[test_type]['test_count'], coverage[test_type]['total_testable_functions'])
         else:
             coverage[test_type]['coverage_percentage'] = 0.0
 
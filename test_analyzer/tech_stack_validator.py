@@ -1,5 +1,11 @@
 import os
 import re
+import logging
+from collections import defaultdict
+
+from test_analyzer.analyzer import MAX_FILE_BYTES, iter_repo_files, literal_text, map_in_pool
+
+logger = logging.getLogger(__name__)
 
 # Define best practices for various technologies, including Java and C#
 BEST_PRACTICES = {
@@ -46,36 +52,106 @@ BEST_PRACTICES = {
     # Add additional tech-specific best practices here...
 }
 
+# File extensions each technology's rules apply to; other files are never opened for them
+TECH_EXTENSIONS = {
+    "Python": (".py",),
+    "Flask": (".py",),
+    "Django": (".py",),
+    "JavaScript": (".js",),
+    "Java": (".java",),
+    "C#": (".cs",),
+}
+
+# Language detected from a file's extension by detect_tech_stack
+EXTENSION_TECH = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".java": "Java",
+    ".cs": "C#",
+    # Add more detections based on file type
+}
+
+# Compile each rule's pattern once at import instead of on every re.search call.
+# Plain-text rules also get their lower-cased text as "literal", so check_file can use a
+# substring search for them, as the analyzer does for LITERAL_TEST_PATTERNS.
+# All rules are ASCII, so they are compiled as bytes and files are scanned without decoding.
+for rules in BEST_PRACTICES.values():
+    for rule in rules:
+        rule["compiled"] = re.compile(rule["pattern"].encode(), re.IGNORECASE)
+        literal = literal_text(rule["pattern"])
+        rule["literal"] = literal.lower().encode() if literal is not None else None
+
+# One alternation per technology over its non-literal rules, matching if any of them would
+# match. A file that doesn't match it can skip those per-rule searches entirely.
+TECH_RULES_RE = {
+    tech: re.compile("|".join(f"(?:{rule['pattern']})" for rule in rules if rule["literal"] is None).encode(),
+                     re.IGNORECASE)
+    if any(rule["literal"] is None for rule in rules) else None
+    for tech, rules in BEST_PRACTICES.items()
+}
+
+FLASK_IMPORT_RE = re.compile(rb"from\s+flask")
+DJANGO_IMPORT_RE = re.compile(rb"from\s+django")
+# Python files are read in chunks when looking for framework imports, which sit near the
+# top, so the rest of a large file is never read. Consecutive chunks overlap so an import
+# split across a chunk boundary is still found.
+IMPORT_SCAN_CHUNK_BYTES = 64 * 1024
+IMPORT_SCAN_OVERLAP_BYTES = 256
+# Files averaging longer lines than this are minified bundles, not hand-written code
+MINIFIED_LINE_LENGTH = 500
+
 
 def detect_tech_stack(repo_path):
     """
     Detects the primary technologies used in the repository based on file extensions and content patterns.
     """
     tech_stack = set()
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-
-            # Detect based on file extensions
-            if file.endswith(".py"):
-                tech_stack.add("Python")
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                    if re.search(r"from\s+flask", content):
+    for entry in iter_repo_files(repo_path):
+        # Detect based on file extensions
+        tech = EXTENSION_TECH.get(os.path.splitext(entry.name)[1])
+        if tech is None:
+            continue
+        tech_stack.add(tech)
+
+        if tech == "Python":
+            # Nothing left to learn from Python files once both frameworks are detected
+            if "Flask" in tech_stack and "Django" in tech_stack:
+                continue
+            with open(entry.path, "rb") as f:
+                tail = b""
+                while True:
+                    chunk = f.read(IMPORT_SCAN_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    window = tail + chunk
+                    if FLASK_IMPORT_RE.search(window):
                         tech_stack.add("Flask")
-                    elif re.search(r"from\s+django", content):
+                        break
+                    elif DJANGO_IMPORT_RE.search(window):
                         tech_stack.add("Django")
-            elif file.endswith(".js"):
-                tech_stack.add("JavaScript")
-            elif file.endswith(".java"):
-                tech_stack.add("Java")
-            elif file.endswith(".cs"):
-                tech_stack.add("C#")
-            # Add more detections based on file type
+                        break
+                    tail = window[-IMPORT_SCAN_OVERLAP_BYTES:]
 
     return list(tech_stack)
 
 
+def is_minified(content):
+    """
+    Tells whether file content looks minified, i.e. its average line is very long.
+    """
+    return len(content) > MINIFIED_LINE_LENGTH * (content.count(b"\n") + 1)
+
+
+def is_oversized(entry):
+    """
+    Tells whether a directory entry is too large to be worth scanning (generated code or bundles).
+    """
+    try:
+        return entry.stat().st_size > MAX_FILE_BYTES
+    except OSError:
+        return True
+
+
 def combine_files_by_pattern(repo_path, tech):
     """
     Combines all files that match patterns for a specific technology.
@@ -88,25 +164,70 @@ def combine_files_by_pattern(repo_path, tech):
         str: Combined content of all matched files.
     """
     combined_content = ""
-    patterns = BEST_PRACTICES.get(tech, [])
+    if tech not in BEST_PRACTICES:
+        return combined_content
+    rules_re = TECH_RULES_RE[tech]
+    literals = [rule["literal"] for rule in BEST_PRACTICES[tech] if rule["literal"] is not None]
+    extensions = TECH_EXTENSIONS[tech]
 
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            try:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
+    for entry in iter_repo_files(repo_path):
+        if not entry.name.endswith(extensions) or is_oversized(entry):
+            continue
+        file_path = entry.path
+        try:
+            with open(file_path, "rb") as f:
+                content = f.read()
+                if is_minified(content):
+                    continue
 
-                    # If any pattern matches, add the file content to combined_content
-                    if any(re.search(rule["pattern"], content, re.IGNORECASE) for rule in patterns):
-                        combined_content += f"\n\n# {file_path}\n{content}"
+                # If any pattern matches, add the file content to combined_content
+                lowered = content.lower()
+                if (any(literal in lowered for literal in literals)
+                        or (rules_re is not None and rules_re.search(content))):
+                    text = content.decode("utf-8", errors="ignore")
+                    combined_content += f"\n\n# {file_path}\n{text}"
 
-            except Exception as e:
-                print(f"Error reading file {file_path}: {e}")
+        except OSError as e:
+            logger.warning("Error reading file %s: %s", file_path, e)
 
     return combined_content
 
 
+def check_file(file_path, techs):
+    """
+    Checks a single file against the best practice rules of each technology in techs.
+
+    Args:
+        file_path (str): Path to the file.
+        techs (tuple): Technologies whose rules to check, all keys of BEST_PRACTICES.
+
+    Returns:
+        list: For each tech, a list of booleans telling whether each rule's pattern matches,
+        or None if the file could not be read or is minified.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            content = f.read()
+    except OSError as e:
+        logger.warning("Error reading file %s: %s", file_path, e)
+        return None
+    if is_minified(content):
+        return None
+
+    lowered = content.lower()
+    tech_matches = []
+    for tech in techs:
+        rules_re = TECH_RULES_RE[tech]
+        # The individual regex rules only need searching if at least one of them matches
+        any_match = rules_re is not None and rules_re.search(content) is not None
+        tech_matches.append([
+            rule["literal"] in lowered if rule["literal"] is not None
+            else any_match and rule["compiled"].search(content) is not None
+            for rule in BEST_PRACTICES[tech]
+        ])
+    return tech_matches
+
+
 def validate_best_practices(repo_path):
     """
     Validates repository code against best practices and groups files for each rule.
@@ -120,32 +241,47 @@ def validate_best_practices(repo_path):
     results = {}
     tech_stack = detect_tech_stack(repo_path)
 
+    checked_techs = []
     for tech in tech_stack:
         results[tech] = []
         
         if tech in BEST_PRACTICES:
+            checked_techs.append(tech)
             for rule in BEST_PRACTICES[tech]:
-                rule_result = {"message": rule["message"], "passing_files": [], "failing_files": []}
+                results[tech].append({"message": rule["message"], "passing_files": [], "failing_files": []})
 
-                for root, _, files in os.walk(repo_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
+    if not checked_techs:
+        return results
 
-                        try:
-                            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                                content = f.read()
+    # Only files with one of a tech's extensions are checked against that tech's rules,
+    # so map each extension to the techs it selects once up front
+    extension_techs = defaultdict(tuple)
+    for tech in checked_techs:
+        for extension in TECH_EXTENSIONS[tech]:
+            extension_techs[extension] += (tech,)
 
-                                if re.search(rule["pattern"], content, re.IGNORECASE):
-                                    # File fails the rule because the pattern matches
-                                    rule_result["failing_files"].append(file_path)
-                                else:
-                                    # File passes this rule
-                                    rule_result["passing_files"].append(file_path)
+    file_paths = []
+    file_techs = []
+    for entry in iter_repo_files(repo_path):
+        techs = extension_techs.get(os.path.splitext(entry.name)[1])
+        if techs and not is_oversized(entry):
+            file_paths.append(entry.path)
+            file_techs.append(techs)
 
-                        except Exception as e:
-                            print(f"Error reading file {file_path}: {e}")
+    # Check files in parallel, in the same process pool the analyzer scans with
+    file_matches = map_in_pool(check_file, file_paths, file_techs)
 
-                results[tech].append(rule_result)
+    for file_path, techs, tech_matches in zip(file_paths, file_techs, file_matches):
+        if tech_matches is None:
+            continue
+        for tech, rule_matches in zip(techs, tech_matches):
+            for rule_result, matched in zip(results[tech], rule_matches):
+                if matched:
+                    # File fails the rule because the pattern matches
+                    rule_result["failing_files"].append(file_path)
+                else:
+                    # File passes this rule
+                    rule_result["passing_files"].append(file_path)
 
     return results
 
@@ -4,9 +4,9 @@ test_patterns = {
         r"@Test",                           # Java/Kotlin
         r"test\(",                          # Python, Kotlin, JS
         r"def\s+test_",                     # Python
-        r"describe\(.*\)", r"it\(.*\)",     # JS/TS/Mocha/Jest
+        r"describe\(", r"it\(",             # JS/TS/Mocha/Jest
         r"should(Be|Equal|Not)",            # Kotest, RSpec
-        r"assert.*",                        # Universal
+        r"\bassert\b",                      # Universal
 
         # === Language Specific ===
         # Java/Kotlin
@@ -22,7 +22,7 @@ test_patterns = {
         # PHP
         r"use\s+PHPUnit", r"extends\s+TestCase",
         # C#
-        r"[TestMethod]", r"using\s+Microsoft.VisualStudio.TestTools.UnitTesting",
+        r"\[TestMethod\]", r"using\s+Microsoft.VisualStudio.TestTools.UnitTesting",
         # Scala
         r"FlatSpec", r"FunSuite",
         # Dart
@@ -45,7 +45,7 @@ test_patterns = {
         # PHP
         r"Laravel\\", r"Mockery",
         # .NET
-        r"[TestServer]", r"InMemoryDatabase",
+        r"\[TestServer\]", r"InMemoryDatabase",
     ],
 
     "e2e": [
@@ -62,6 +62,6 @@ test_patterns = {
         # Python
         r"from\s+selenium", r"behave", r"robotframework",
         # .NET
-        r"SpecFlow", r"[Binding]",
+        r"SpecFlow", r"\[Binding\]",
     ]
 }
@@ -0,0 +1,47 @@
+import re
+import string
+import unittest
+
+from test_analyzer.analyzer import test_patterns as analyzer_patterns, find_test_pattern
+from test_analyzer.test_patterns import test_patterns as reference_patterns
+
+PLAIN_SENTENCE = "Our team will review the service API design and log in to the browser as a user."
+
+ALL_PATTERNS = [
+    (source, test_type, pattern)
+    for source, patterns in (("analyzer", analyzer_patterns), ("test_patterns", reference_patterns))
+    for test_type, type_patterns in patterns.items()
+    for pattern in type_patterns
+]
+
+
+class TestPatternsTest(unittest.TestCase):
+    def assertNoPatternMatches(self, text, flags=re.IGNORECASE | re.MULTILINE):
+        for source, test_type, pattern in ALL_PATTERNS:
+            with self.subTest(source=source, test_type=test_type, pattern=pattern):
+                self.assertIsNone(re.search(pattern, text, flags))
+
+    def test_no_pattern_matches_empty_string(self):
+        self.assertNoPatternMatches("")
+
+    def test_no_pattern_matches_plain_sentence(self):
+        self.assertNoPatternMatches(PLAIN_SENTENCE)
+
+    def test_no_pattern_matches_single_letter(self):
+        # Unescaped "[TestMethod]"-style patterns are character classes matching any one of their letters
+        for letter in string.ascii_letters:
+            self.assertNoPatternMatches(letter, flags=0)
+
+    def test_bracketed_attributes_match_literally(self):
+        reference = [pattern for type_patterns in reference_patterns.values() for pattern in type_patterns]
+        for attribute in ("[TestMethod]", "[TestServer]", "[Binding]"):
+            with self.subTest(attribute=attribute):
+                self.assertTrue(any(re.search(pattern, attribute) for pattern in reference))
+
+    def test_fused_patterns_ignore_non_test_content(self):
+        self.assertIsNone(find_test_pattern(b""))
+        self.assertIsNone(find_test_pattern(PLAIN_SENTENCE.encode()))
+
+
+if __name__ == "__main__":
+    unittest.main()